@@ -0,0 +1,259 @@
+"""Нагрузочное тестирование /api/db_version при разных размерах пула подключений.
+
+Пример запуска (из каталога 1, PostgreSQL настроен через .env):
+    python benchmark.py --pool-sizes 1:1 1:5 5:10 --concurrency 1 10 50 --requests 2000 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import asyncpg
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from main import create_app
+
+
+class _TimedAcquire:
+    """Обёртка над PoolAcquireContext, замеряющая время ожидания подключения"""
+
+    def __init__(self, acquire_context: Any, waits: list[float]):
+        self._acquire_context = acquire_context
+        self._waits = waits
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        start = time.perf_counter()
+        connection = await self._acquire_context.__aenter__()
+        self._waits.append(time.perf_counter() - start)
+        return connection
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._acquire_context.__aexit__(*exc_info)
+
+
+class TimedPool:
+    """Прокси для asyncpg.Pool: остальные методы делегируются исходному пулу"""
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+        self.acquire_waits: list[float] = []
+
+    def acquire(self, *args: Any, **kwargs: Any) -> _TimedAcquire:
+        return _TimedAcquire(self._pool.acquire(*args, **kwargs), self.acquire_waits)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Перцентиль методом nearest-rank"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(len(ordered) * q / 100) - 1))
+    return ordered[index]
+
+
+def summarize_ms(values: list[float]) -> dict[str, float | None]:
+    def to_ms(value: float | None) -> float | None:
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "mean": to_ms(sum(values) / len(values)) if values else None,
+        "p50": to_ms(percentile(values, 50)),
+        "p95": to_ms(percentile(values, 95)),
+        "p99": to_ms(percentile(values, 99)),
+        "max": to_ms(max(values, default=None)),
+    }
+
+
+@asynccontextmanager
+async def serve_app(app: FastAPI, mode: str, host: str, port: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Запускает приложение in-process (ASGI) или под uvicorn и возвращает клиент к нему"""
+    if mode == "asgi":
+        async with app.router.lifespan_context(app):
+            # необработанные исключения приложения превращаются в 500, как под uvicorn
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                yield client
+        return
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if server_task.done():
+                # пробрасываем ошибку запуска (например, недоступность PostgreSQL)
+                await server_task
+                raise RuntimeError("uvicorn exited before startup")
+            await asyncio.sleep(0.05)
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=f"http://{host}:{port}", limits=limits) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+async def run_load(client: httpx.AsyncClient, mix: list[tuple[str, float]], concurrency: int,
+                   total_requests: int, duration: float | None, seed: int) -> dict[str, Any]:
+    """Гоняет нагрузку заданным числом воркеров до исчерпания запросов или истечения duration"""
+    rng = random.Random(seed)
+    paths = [path for path, _ in mix]
+    weights = [weight for _, weight in mix]
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    per_path: Counter[str] = Counter()
+    issued = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker() -> None:
+        nonlocal issued
+        while issued < total_requests and (deadline is None or time.perf_counter() < deadline):
+            issued += 1
+            path = rng.choices(paths, weights)[0]
+            per_path[path] += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors[str(response.status_code)] += 1
+            except Exception as e:
+                # любая ошибка считается в error rate, а не обрывает прогон
+                errors[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    completed = len(latencies)
+    return {
+        "requests": completed,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else None,
+        "latency_ms": summarize_ms(latencies),
+        "error_rate": round(sum(errors.values()) / completed, 4) if completed else None,
+        "errors": dict(errors),
+        "requests_by_path": dict(per_path),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    logger = logging.getLogger(__name__)
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    results = []
+
+    for index, (pool_min_size, pool_max_size) in enumerate(args.pool_sizes):
+        # конфигурация БД читается из окружения при старте приложения
+        os.environ["DB_POOL_MIN_SIZE"] = str(pool_min_size)
+        os.environ["DB_POOL_MAX_SIZE"] = str(pool_max_size)
+        app = create_app()
+
+        async with serve_app(app, args.mode, args.host, args.port + index) as client:
+            pool = TimedPool(app.state.pool)
+            app.state.pool = pool
+
+            for concurrency in args.concurrency:
+                if args.warmup:
+                    await run_load(client, args.mix, concurrency, args.warmup, None, args.seed)
+                pool.acquire_waits.clear()
+
+                result = await run_load(client, args.mix, concurrency, args.requests, args.duration, args.seed)
+                result = {
+                    "pool_min_size": pool_min_size,
+                    "pool_max_size": pool_max_size,
+                    "concurrency": concurrency,
+                    **result,
+                    "pool_acquire_wait_ms": summarize_ms(pool.acquire_waits),
+                }
+                results.append(result)
+                logger.info(
+                    f"pool={pool_min_size}:{pool_max_size} concurrency={concurrency} "
+                    f"rps={result['throughput_rps']} p50={result['latency_ms']['p50']}ms "
+                    f"p99={result['latency_ms']['p99']}ms "
+                    f"acquire_p99={result['pool_acquire_wait_ms']['p99']}ms "
+                    f"error_rate={result['error_rate']}"
+                )
+
+            app.state.pool = pool._pool
+
+    return {
+        "benchmark": {
+            "mode": args.mode,
+            "requests": args.requests,
+            "duration_s": args.duration,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "mix": dict(args.mix),
+            "started_at": started_at,
+        },
+        "results": results,
+    }
+
+
+def _pool_size(value: str) -> tuple[int, int]:
+    try:
+        min_size, max_size = (int(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected MIN:MAX, got {value!r}")
+    if not 0 <= min_size <= max_size or max_size < 1:
+        raise argparse.ArgumentTypeError(f"invalid pool size {value!r}")
+    return min_size, max_size
+
+
+def _mix_entry(value: str) -> tuple[str, float]:
+    path, _, weight = value.partition("=")
+    try:
+        return path, float(weight or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected PATH=WEIGHT, got {value!r}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi",
+                        help="in-process ASGI transport or real HTTP via uvicorn")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001,
+                        help="base port for uvicorn mode, incremented per pool size")
+    parser.add_argument("--pool-sizes", type=_pool_size, nargs="+", default=[(1, 10)],
+                        metavar="MIN:MAX", help="pool sizes to sweep")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50],
+                        help="numbers of concurrent clients to sweep")
+    parser.add_argument("--mix", type=_mix_entry, nargs="+", default=[("/api/db_version", 1.0)],
+                        metavar="PATH=WEIGHT", help="weighted request mix")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per run")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="stop a run after this many seconds even if --requests is not reached")
+    parser.add_argument("--warmup", type=int, default=100, help="uncounted requests before each run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-", help="JSON results file, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    report = asyncio.run(run_benchmark(args))
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+
+
+if __name__ == "__main__":
+    main()
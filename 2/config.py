@@ -12,6 +12,13 @@ class Config:
         self.github_api_token: str = os.getenv("GITHUB_TOKEN")
         self.max_concurrent_requests: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
         self.requests_per_second: int = int(os.getenv("REQUESTS_PER_SECOND", "5"))
+        self.request_timeout: float = float(os.getenv("REQUEST_TIMEOUT", "10"))
+        self.max_retries: int = int(os.getenv("MAX_RETRIES", "3"))
+        self.backoff_base: float = float(os.getenv("BACKOFF_BASE", "0.5"))
+        self.backoff_max: float = float(os.getenv("BACKOFF_MAX", "30"))
+        self.circuit_failure_threshold: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.circuit_recovery_timeout: float = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30"))
+        self.hedge_requests: bool = os.getenv("HEDGE_REQUESTS", "false").lower() == "true"
         self.log_level: str = os.getenv("LOG_LEVEL", "INFO")
 
 async def get_config() -> Config:
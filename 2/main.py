@@ -10,7 +10,14 @@ async def main():
     scrapper = GithubReposScrapper(
         access_token=config.github_api_token,
         max_concurrent_requests=config.max_concurrent_requests,
-        requests_per_second=config.requests_per_second
+        requests_per_second=config.requests_per_second,
+        request_timeout=config.request_timeout,
+        max_retries=config.max_retries,
+        backoff_base=config.backoff_base,
+        backoff_max=config.backoff_max,
+        circuit_failure_threshold=config.circuit_failure_threshold,
+        circuit_recovery_timeout=config.circuit_recovery_timeout,
+        hedge_requests=config.hedge_requests,
     )
     try:
         repositories = await scrapper.get_repositories()
@@ -0,0 +1,89 @@
+import random
+import time
+from collections import deque
+
+
+# Статусы, при которых запрос имеет смысл повторить
+RETRYABLE_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class GithubApiError(Exception):
+    """Ошибка запроса к GitHub API"""
+
+    def __init__(self, endpoint: str, message: str, status: int | None = None,
+                 retryable: bool = False, retry_after: float | None = None):
+        super().__init__(f"{endpoint}: {message}")
+        self.endpoint = endpoint
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(GithubApiError):
+    """Запрос отклонён, так как circuit breaker разомкнут"""
+
+    def __init__(self, endpoint: str):
+        super().__init__(endpoint, "circuit breaker is open")
+
+
+class CircuitBreaker:
+    """Размыкает цепь после серии подряд идущих сбоев и пропускает пробный запрос по истечении recovery_timeout"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._probe_in_flight or time.monotonic() - self._opened_at < self._recovery_timeout:
+            return False
+        # half-open: пропускаем единственный пробный запрос
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Снимает флаг пробного запроса, если попытка прервалась без результата (например, отмена)"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probe_in_flight or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+
+class LatencyTracker:
+    """Скользящее окно длительностей запросов для расчёта перцентилей"""
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=window_size)
+        self._min_samples = min_samples
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, q: float) -> float | None:
+        """Возвращает q-й перцентиль или None, пока накоплено недостаточно замеров"""
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * q / 100))
+        return ordered[index]
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Экспоненциальная задержка с full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
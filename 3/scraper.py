@@ -1,19 +1,41 @@
 import asyncio
 import logging
 import ssl
+import time
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import Any
 from collections import Counter
 
-from aiohttp import ClientSession, ClientConnectorError, ClientError, TCPConnector
+from aiohttp import ClientSession, ClientConnectorError, ClientError, ClientTimeout, TCPConnector
 from aiolimiter import AsyncLimiter
 
 from config import GITHUB_API_BASE_URL
 from models import Repository, RepositoryAuthorCommitsNum
+from resilience import (
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    CircuitOpenError,
+    GithubApiError,
+    LatencyTracker,
+    backoff_delay,
+)
 
 
 class GithubReposScrapper:
-    def __init__(self, access_token: str, max_concurrent_requests: int = 30, requests_per_second: int = 5):
+    def __init__(
+        self,
+        access_token: str,
+        max_concurrent_requests: int = 30,
+        requests_per_second: int = 5,
+        request_timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        circuit_failure_threshold: int = 5,
+        circuit_recovery_timeout: float = 30.0,
+        hedge_requests: bool = False,
+    ):
         ssl_context = ssl.create_default_context()
         ssl_context.check_hostname = False
         ssl_context.verify_mode = ssl.CERT_NONE
@@ -37,24 +59,124 @@ class GithubReposScrapper:
         # RPS
         self._rate_limiter = AsyncLimiter(requests_per_second, 1.0)
 
+        # Устойчивость к сбоям
+        self._timeout = ClientTimeout(total=request_timeout)
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._circuit_breaker = CircuitBreaker(circuit_failure_threshold, circuit_recovery_timeout)
+        self._hedge_requests = hedge_requests
+        self._latency = LatencyTracker()
+
     async def _make_request(self, endpoint: str, method: str = "GET", params: dict[str, Any] | None = None) -> Any:
-        """Метод для выполнения запросов к GitHub API с учетом ограничений MCR и RPS"""
+        """Метод для выполнения запросов к GitHub API с учетом ограничений MCR и RPS.
+
+        Повторяет запрос при временных сбоях с экспоненциальной задержкой и jitter,
+        при исчерпании попыток или разомкнутом circuit breaker выбрасывает GithubApiError.
+        """
+        url = f"{GITHUB_API_BASE_URL}/{endpoint}"
+        error: GithubApiError | None = None
+
+        for attempt in range(self._max_retries + 1):
+            if not self._circuit_breaker.allow_request():
+                raise CircuitOpenError(endpoint)
+            try:
+                result = await self._send_hedged(endpoint, method, url, params)
+            except GithubApiError as e:
+                if not e.retryable:
+                    # сервер ответил осмысленной ошибкой, значит он доступен
+                    self._circuit_breaker.record_success()
+                    raise
+                self._circuit_breaker.record_failure()
+                error = e
+            except BaseException:
+                # иначе half-open probe останется занятым и цепь не замкнётся до конца запуска
+                self._circuit_breaker.release_probe()
+                raise
+            else:
+                self._circuit_breaker.record_success()
+                return result
+
+            if attempt < self._max_retries:
+                delay = max(
+                    backoff_delay(attempt, self._backoff_base, self._backoff_max),
+                    error.retry_after or 0.0,
+                )
+                self._logger.warning(
+                    f"{error}; retry {attempt + 1}/{self._max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        raise error
+
+    async def _send_hedged(self, endpoint: str, method: str, url: str, params: dict[str, Any] | None) -> Any:
+        """Отправляет запрос и, если он выполняется дольше p95, дублирует его; возвращает первый успешный ответ"""
+        primary_started = asyncio.Event()
+        pending = {asyncio.create_task(self._send(endpoint, method, url, params, primary_started))}
+        try:
+            hedge_delay = self._latency.percentile(95) if self._hedge_requests else None
+            if hedge_delay is not None:
+                # отсчёт начинаем после захвата слота семафора, чтобы не учитывать ожидание в очереди
+                started = asyncio.create_task(primary_started.wait())
+                await asyncio.wait(pending | {started}, return_when=asyncio.FIRST_COMPLETED)
+                started.cancel()
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                # дублируем только при наличии свободного слота, чтобы не вытеснять другие запросы
+                if not done and not self._semaphore.locked():
+                    self._logger.debug(f"Hedging request to {endpoint} after {hedge_delay:.2f}s")
+                    pending.add(asyncio.create_task(self._send(endpoint, method, url, params)))
+
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _send(self, endpoint: str, method: str, url: str, params: dict[str, Any] | None,
+                    started: asyncio.Event | None = None) -> Any:
+        """Одна попытка запроса; любые сбои приводятся к GithubApiError"""
         async with self._semaphore:
             async with self._rate_limiter:
+                if started is not None:
+                    started.set()
+                start = time.monotonic()
                 try:
-                    async with self._session.request(method, f"{GITHUB_API_BASE_URL}/{endpoint}", params=params) as response:
+                    async with self._session.request(method, url, params=params, timeout=self._timeout) as response:
                         if response.status == 200:
-                            return await response.json()
-                        else:
-                            self._logger.error(
-                                f"HTTP {response.status} error for {endpoint}")
-                            return []
+                            data = await response.json()
+                            self._latency.add(time.monotonic() - start)
+                            return data
+                        raise self._http_error(endpoint, response.status, response.headers)
+                except GithubApiError:
+                    raise
+                except asyncio.TimeoutError:
+                    raise GithubApiError(endpoint, f"timeout after {self._timeout.total}s", retryable=True)
                 except (ClientConnectorError, ClientError) as e:
-                    self._logger.error(f"Connection error for {endpoint}: {e}")
-                    return []
-                except Exception as e:
-                    self._logger.error(f"Unexpected error for {endpoint}: {e}")
-                    return []
+                    raise GithubApiError(endpoint, f"connection error: {e}", retryable=True)
+                except ValueError as e:
+                    # некорректное тело ответа (например, битый JSON) повтором не исправить
+                    raise GithubApiError(endpoint, f"invalid response body: {e}", status=200)
+
+    def _http_error(self, endpoint: str, status: int, headers: Mapping[str, str]) -> GithubApiError:
+        """Классифицирует HTTP-ошибку: временная ли она и сколько ждать перед повтором"""
+        retry_after: float | None = None
+        if headers.get("Retry-After", "").isdigit():
+            retry_after = float(headers["Retry-After"])
+        elif headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+            retry_after = max(0.0, float(headers["X-RateLimit-Reset"]) - time.time())
+
+        if retry_after is not None:
+            # ждать сброса лимита дольше backoff_max бессмысленно, сообщаем об ошибке сразу
+            retryable = retry_after <= self._backoff_max
+        else:
+            retryable = status in RETRYABLE_STATUSES
+        return GithubApiError(endpoint, f"HTTP {status}", status=status,
+                              retryable=retryable, retry_after=retry_after)
 
     async def _get_top_repositories(self, limit: int = 100) -> list[dict[str, Any]]:
         """GitHub REST API: https://docs.github.com/en/rest/search/search?apiVersion=2022-11-28#search-repositories"""
@@ -63,16 +185,21 @@ class GithubReposScrapper:
             params={"q": "stars:>1", "sort": "stars",
                     "order": "desc", "per_page": limit},
         )
-        return data.get("items", []) if isinstance(data, dict) else []
+        return data.get("items", [])
 
     async def _get_repository_commits(self, owner: str, repo: str) -> list[dict[str, Any]]:
         """GitHub REST API: https://docs.github.com/en/rest/commits/commits?apiVersion=2022-11-28#list-commits"""
         since_date = (datetime.now() - timedelta(days=1)).isoformat()
-        data = await self._make_request(
-            endpoint=f"repos/{owner}/{repo}/commits",
-            params={"since": since_date},
-        )
-        return data if isinstance(data, list) else []
+        try:
+            return await self._make_request(
+                endpoint=f"repos/{owner}/{repo}/commits",
+                params={"since": since_date},
+            )
+        except GithubApiError as e:
+            # 409 Conflict GitHub возвращает для пустого репозитория
+            if e.status == 409:
+                return []
+            raise
 
     def _count_authors_commits_today(self, commits: list[dict[str, Any]]) -> list[RepositoryAuthorCommitsNum]:
         """Подсчитываем кол-во коммитов по авторам"""
@@ -108,64 +235,61 @@ class GithubReposScrapper:
         )
 
     async def get_repositories(self) -> list[Repository]:
-        """Получаем список репозиториев и подсчитываем количество коммитов по авторам за последний день"""
-        try:
-            repositories = await self._get_top_repositories()
-            tasks = [
-                self._process_repository(repo, i + 1)
-                for i, repo in enumerate(repositories)
-            ]
+        """Получаем список репозиториев и подсчитываем количество коммитов по авторам за последний день.
+
+        Ошибка получения топа пробрасывается наружу; репозитории, коммиты которых
+        получить не удалось, логируются и не попадают в результат.
+        """
+        repositories = await self._get_top_repositories()
+        tasks = [
+            self._process_repository(repo, i + 1)
+            for i, repo in enumerate(repositories)
+        ]
+
+        result_repositories_list = await asyncio.gather(*tasks, return_exceptions=True)
+
+        valid_repositories = []
+        for i, result in enumerate(result_repositories_list):
+            if isinstance(result, Exception):
+                self._logger.error(
+                    f"Error processing repository {i+1}: {result}")
+            else:
+                valid_repositories.append(result)
 
-            result_repositories_list = await asyncio.gather(*tasks, return_exceptions=True)
+        self._logger.info(f"get_repositories выполнена! " +
+                          f"Обработано {len(valid_repositories)} из {len(result_repositories_list)} репозиториев")
+        return valid_repositories
 
+    async def get_repositories_batched(self, batch_size: int = 20):
+        """Асинхронный генератор, который возвращает репозитории батчами.
+
+        Ошибка получения топа пробрасывается наружу, а не завершает генерацию молча.
+        """
+        repositories = await self._get_top_repositories()
+        
+        for batch_start in range(0, len(repositories), batch_size):
+            batch_end = min(batch_start + batch_size, len(repositories))
+            batch_repos = repositories[batch_start:batch_end]
+            
+            # задачи для параллельной обработки батча
+            tasks = [
+                self._process_repository(repo, batch_start + i + 1)
+                for i, repo in enumerate(batch_repos)
+            ]
+            
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            
             valid_repositories = []
-            for i, result in enumerate(result_repositories_list):
+            for i, result in enumerate(results):
                 if isinstance(result, Exception):
                     self._logger.error(
-                        f"Error processing repository {i+1}: {result}")
+                        f"Ошибка обработки репозитория {batch_start + i + 1}: {result}"
+                    )
                 else:
                     valid_repositories.append(result)
-
-            self._logger.info(f"get_repositories выполнена! " +
-                              f"Обработано {len(valid_repositories)} из {len(result_repositories_list)} репозиториев")
-            return valid_repositories
-
-        except Exception as e:
-            self._logger.error(f"Error getting repositories: {e}")
-            return []
-
-    async def get_repositories_batched(self, batch_size: int = 20):
-        """Асинхронный генератор, который возвращает репозитории батчами."""
-        try:
-            repositories = await self._get_top_repositories()
             
-            for batch_start in range(0, len(repositories), batch_size):
-                batch_end = min(batch_start + batch_size, len(repositories))
-                batch_repos = repositories[batch_start:batch_end]
-                
-                # задачи для параллельной обработки батча
-                tasks = [
-                    self._process_repository(repo, batch_start + i + 1)
-                    for i, repo in enumerate(batch_repos)
-                ]
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                valid_repositories = []
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        self._logger.error(
-                            f"Ошибка обработки репозитория {batch_start + i + 1}: {result}"
-                        )
-                    else:
-                        valid_repositories.append(result)
-                
-                if valid_repositories:
-                    yield valid_repositories
-                
-        except Exception as e:
-            self._logger.error(f"Error getting repositories: {e}")
-            return
+            if valid_repositories:
+                yield valid_repositories
 
     async def close(self):
         await self._session.close()
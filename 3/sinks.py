@@ -0,0 +1,185 @@
+import asyncio
+import gzip
+import json
+import logging
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import Config
+from database import ClickHouseRepository
+from models import Repository
+
+
+class RepositorySink(Protocol):
+    """Интерфейс приёмника данных о репозиториях (ClickHouse, файлы)"""
+
+    async def connect(self) -> None: ...
+
+    async def save_repositories(self, repositories: list[Repository]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+REPOSITORIES_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("owner", pa.string()),
+    ("stars", pa.int32()),
+    ("watchers", pa.int32()),
+    ("forks", pa.int32()),
+    ("language", pa.string()),
+    ("updated", pa.timestamp("s")),
+])
+
+POSITIONS_SCHEMA = pa.schema([
+    ("date", pa.date32()),
+    ("repo", pa.string()),
+    ("position", pa.uint32()),
+])
+
+AUTHORS_COMMITS_SCHEMA = pa.schema([
+    ("date", pa.date32()),
+    ("repo", pa.string()),
+    ("author", pa.string()),
+    ("commits_num", pa.int32()),
+])
+
+TABLE_SCHEMAS: dict[str, pa.Schema] = {
+    "repositories": REPOSITORIES_SCHEMA,
+    "repositories_positions": POSITIONS_SCHEMA,
+    "repositories_authors_commits": AUTHORS_COMMITS_SCHEMA,
+}
+
+
+def _build_rows(repositories: list[Repository]) -> dict[str, list[dict[str, Any]]]:
+    """Раскладывает батч репозиториев по трём логическим таблицам (см. tables.sql)"""
+    current_date = date.today()
+    current_datetime = datetime.now().replace(microsecond=0)
+
+    return {
+        "repositories": [
+            {
+                "name": repo.name,
+                "owner": repo.owner,
+                "stars": repo.stars,
+                "watchers": repo.watchers,
+                "forks": repo.forks,
+                "language": repo.language or "",
+                "updated": current_datetime,
+            }
+            for repo in repositories
+        ],
+        "repositories_positions": [
+            {"date": current_date, "repo": repo.name, "position": repo.position}
+            for repo in repositories
+        ],
+        "repositories_authors_commits": [
+            {
+                "date": current_date,
+                "repo": repo.name,
+                "author": author_commit.author,
+                "commits_num": author_commit.commits_num,
+            }
+            for repo in repositories
+            for author_commit in repo.authors_commits_num_today
+        ],
+    }
+
+
+class ParquetSink:
+    """Потоковая запись в Parquet: по файлу на таблицу, по row group на батч"""
+
+    def __init__(self, output_dir: str, compression: str = "zstd"):
+        self._output_dir = Path(output_dir)
+        self._compression = compression
+        self._logger = logging.getLogger(__name__)
+        self._writers: dict[str, pq.ParquetWriter] = {}
+
+    async def connect(self) -> None:
+        """Открываем по одному ParquetWriter на каждую таблицу."""
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for table, schema in TABLE_SCHEMAS.items():
+            path = self._output_dir / f"{table}_{run_id}.parquet"
+            self._writers[table] = pq.ParquetWriter(path, schema, compression=self._compression)
+        self._logger.info(f"Запись в Parquet: {self._output_dir}")
+
+    async def close(self) -> None:
+        """Закрываем writers, дописывая футер файлов."""
+        for writer in self._writers.values():
+            await asyncio.to_thread(writer.close)
+        self._writers.clear()
+
+    async def save_repositories(self, repositories: list[Repository]) -> None:
+        """Сохраняем батч: каждая таблица получает новую row group, в памяти батч не накапливается"""
+        if not repositories:
+            self._logger.warning("Не найдено репозиториев для сохранения")
+            return
+
+        for table, rows in _build_rows(repositories).items():
+            if not rows:
+                continue
+            arrow_table = pa.Table.from_pylist(rows, schema=TABLE_SCHEMAS[table])
+            await asyncio.to_thread(self._writers[table].write_table, arrow_table)
+            self._logger.debug(f"Записано {len(rows)} строк в {table}")
+
+
+class NdjsonSink:
+    """Запись в gzip NDJSON: по файлу на таблицу, одна JSON-строка на запись"""
+
+    def __init__(self, output_dir: str):
+        self._output_dir = Path(output_dir)
+        self._logger = logging.getLogger(__name__)
+        self._files: dict[str, gzip.GzipFile] = {}
+
+    async def connect(self) -> None:
+        """Открываем по одному gzip-файлу на каждую таблицу."""
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for table in TABLE_SCHEMAS:
+            path = self._output_dir / f"{table}_{run_id}.ndjson.gz"
+            self._files[table] = gzip.open(path, "wb")
+        self._logger.info(f"Запись в NDJSON: {self._output_dir}")
+
+    async def close(self) -> None:
+        """Закрываем файлы, дописывая gzip-трейлер."""
+        for file in self._files.values():
+            await asyncio.to_thread(file.close)
+        self._files.clear()
+
+    async def save_repositories(self, repositories: list[Repository]) -> None:
+        """Сохраняем батч, дописывая строки в конец файлов"""
+        if not repositories:
+            self._logger.warning("Не найдено репозиториев для сохранения")
+            return
+
+        for table, rows in _build_rows(repositories).items():
+            if not rows:
+                continue
+            payload = "".join(
+                json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in rows
+            ).encode("utf-8")
+            await asyncio.to_thread(self._files[table].write, payload)
+            self._logger.debug(f"Записано {len(rows)} строк в {table}")
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def create_sink(config: Config, batch_size: int) -> RepositorySink:
+    """Создаёт приёмник данных по значению SINK из конфигурации"""
+    if config.sink == "clickhouse":
+        return ClickHouseRepository(config=config, batch_size=batch_size)
+    if config.sink == "parquet":
+        return ParquetSink(output_dir=config.sink_output_dir)
+    if config.sink == "ndjson":
+        return NdjsonSink(output_dir=config.sink_output_dir)
+    raise ValueError(f"Unknown sink: {config.sink}")